@@ -11,19 +11,88 @@ Implements iterative reasoning with Gemini function calling:
 """
 
 import os
-import traceback
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 
 try:
-    from google import genai
     from google.genai import types
 except ImportError:
-    genai = None
     types = None
 
 from .tools_registry import get_all_function_declarations, get_tool_module
 
+# Tools with no side effects on the workspace; a parallel batch made up only of
+# these can run concurrently without ordering concerns
+READ_ONLY_TOOLS = frozenset({
+    "read_file", "grep", "list_files", "find_files", "fetch_url", "search_web",
+    "read", "ls", "glob", "webfetch", "websearch",
+})
+
+# Upper bound on worker threads for one concurrent batch
+MAX_PARALLEL_TOOLS = 8
+
+# Attach full tracebacks to tool errors only when debugging (CODEGEN_DEBUG=1)
+DEBUG = bool(os.environ.get("CODEGEN_DEBUG"))
+
+# Static agent instructions. Kept byte-identical across calls and placed first
+# so the prompt shares a stable prefix (Gemini implicit caching); everything
+# that varies per task goes after it in AGENT_TASK_TEMPLATE.
+AGENT_INSTRUCTIONS = """You are an iterative coding agent.
+
+You will accomplish each goal by deciding ONE action at a time, seeing the result, and then deciding the next action.
+
+CRITICAL EFFICIENCY RULES:
+1. **NEVER use manage_todos for analysis/read-only tasks** (explain, summarize, find, search)
+2. For ANALYSIS: Read 2-3 key files → Synthesize → task_complete (aim for 3-5 iterations total)
+3. For MODIFICATION of 8+ files: Use manage_todos to track changes
+4. Choose ONE tool to call next (not a full plan)
+5. Use discovery tools (list_files, find_files, grep) before making changes
+6. Read files before editing them to understand context
+7. **Be iteration-conscious**: Each iteration costs tokens. Optimize for speed.
+
+**ANALYSIS TASK WORKFLOW** (explain, summarize, find):
+✅ CORRECT (3-5 iterations):
+- Iteration 1: list_files or grep to discover structure
+- Iteration 2: read_file (key file 1) 
+- Iteration 3: read_file (key file 2) - understand the pattern
+- Iteration 4: task_complete with comprehensive synthesized answer
+
+❌ WRONG (wastes iterations):
+- Don't create todos for analysis
+- Don't read every single file - sample representative ones
+- Don't retry failed file reads with the same path
+
+**MODIFICATION TASK WORKFLOW** (8+ files only):
+- Iteration 1: grep to find all files to modify
+- Iteration 2: manage_todos with ALL items at once
+- Iterations 3+: read + edit + pop todo for each file
+- Final: task_complete
+
+**ERROR HANDLING**:
+- If a file doesn't exist, DON'T retry the same path
+- Check file listings before attempting to read
+- Learn from errors and adapt approach
+
+**CONVERSATION MEMORY**:
+- When user says "that file", "the comment", "that function" - check conversation history
+- Recently created/modified files are likely what user is referring to
+- Use context clues from previous tasks
+
+⚠️ Efficiency target: 3-5 iterations for analysis, 2-4 for simple tasks
+"""
+
+# Per-task tail of the prompt; only the goal and progress counter vary
+AGENT_TASK_TEMPLATE = """Your goal is:
+{goal}
+
+Current progress: iteration {iterations}/{max_iterations}
+"""
+
+# Matches "retry in 17.686472071s" / "retry in 17s" in rate-limit errors
+RETRY_TIME_RE = re.compile(r'retry in (\d+(?:\.\d+)?)\s*s')
+
 
 @dataclass
 class AgentState:
@@ -96,14 +165,18 @@ class AgenticLoop:
         # Get function declarations from all tools
         if types:
             self.function_declarations = get_all_function_declarations(client=self.client)
+            # Tools and sampling settings never change between calls; build the config once
+            self.generate_config = types.GenerateContentConfig(
+                tools=[types.Tool(function_declarations=self.function_declarations)],
+                temperature=0.1
+            )
         else:
             self.function_declarations = []
+            self.generate_config = None
     
     def _extract_retry_time(self, error_str: str) -> Optional[str]:
         """Extract retry time from error message."""
-        import re
-        # Look for patterns like "retry in 17.686472071s" or "retry in 17s"
-        match = re.search(r'retry in (\d+(?:\.\d+)?)\s*s', error_str.lower())
+        match = RETRY_TIME_RE.search(error_str.lower())
         if match:
             seconds = float(match.group(1))
             if seconds < 60:
@@ -115,7 +188,8 @@ class AgenticLoop:
     
     def _build_agent_prompt(self, state: AgentState) -> str:
         """Build prompt for next action decision."""
-        prompt_parts = []
+        # Static instructions first so every prompt starts with the same prefix
+        prompt_parts = [AGENT_INSTRUCTIONS]
         
         # Add conversation memory if available (cross-task context)
         if self.conversation_memory:
@@ -124,51 +198,11 @@ class AgenticLoop:
                 prompt_parts.append(context)
                 prompt_parts.append("\n---\n")
         
-        prompt_parts.append(f"""You are an iterative coding agent. Your goal is:
-{state.goal}
-
-You will accomplish this by deciding ONE action at a time, seeing the result, and then deciding the next action.
-
-CRITICAL EFFICIENCY RULES:
-1. **NEVER use manage_todos for analysis/read-only tasks** (explain, summarize, find, search)
-2. For ANALYSIS: Read 2-3 key files → Synthesize → task_complete (aim for 3-5 iterations total)
-3. For MODIFICATION of 8+ files: Use manage_todos to track changes
-4. Choose ONE tool to call next (not a full plan)
-5. Use discovery tools (list_files, find_files, grep) before making changes
-6. Read files before editing them to understand context
-7. **Be iteration-conscious**: Each iteration costs tokens. Optimize for speed.
-
-**ANALYSIS TASK WORKFLOW** (explain, summarize, find):
-✅ CORRECT (3-5 iterations):
-- Iteration 1: list_files or grep to discover structure
-- Iteration 2: read_file (key file 1) 
-- Iteration 3: read_file (key file 2) - understand the pattern
-- Iteration 4: task_complete with comprehensive synthesized answer
-
-❌ WRONG (wastes iterations):
-- Don't create todos for analysis
-- Don't read every single file - sample representative ones
-- Don't retry failed file reads with the same path
-
-**MODIFICATION TASK WORKFLOW** (8+ files only):
-- Iteration 1: grep to find all files to modify
-- Iteration 2: manage_todos with ALL items at once
-- Iterations 3+: read + edit + pop todo for each file
-- Final: task_complete
-
-**ERROR HANDLING**:
-- If a file doesn't exist, DON'T retry the same path
-- Check file listings before attempting to read
-- Learn from errors and adapt approach
-
-**CONVERSATION MEMORY**:
-- When user says "that file", "the comment", "that function" - check conversation history
-- Recently created/modified files are likely what user is referring to
-- Use context clues from previous tasks
-
-Current progress: iteration {state.iterations}/{state.max_iterations}
-⚠️ Efficiency target: 3-5 iterations for analysis, 2-4 for simple tasks
-""")
+        prompt_parts.append(AGENT_TASK_TEMPLATE.format_map({
+            "goal": state.goal,
+            "iterations": state.iterations,
+            "max_iterations": state.max_iterations,
+        }))
         
         # Add recent context if available
         if state.conversation_history:
@@ -194,8 +228,9 @@ Current progress: iteration {state.iterations}/{state.max_iterations}
         
         # AGGRESSIVE token optimization: Trim conversation history early
         # Keep only last 6 exchanges (12 messages) to minimize token usage
+        # Trim in place (initial prompt + last 11) instead of rebuilding the list
         if len(state.llm_messages) > 12:
-            state.llm_messages = state.llm_messages[:1] + state.llm_messages[-11:]
+            del state.llm_messages[1:-11]
         
         # Try models in fallback order
         for model_index in range(self.current_model_index, len(self.MODEL_FALLBACK_ORDER)):
@@ -209,10 +244,7 @@ Current progress: iteration {state.iterations}/{state.max_iterations}
                     response = self.client.models.generate_content(
                         model=model,
                         contents=state.llm_messages,
-                        config=types.GenerateContentConfig(
-                            tools=[types.Tool(function_declarations=self.function_declarations)],
-                            temperature=0.1
-                        )
+                        config=self.generate_config
                     )
                     
                     # Success - update current model if we switched
@@ -226,17 +258,19 @@ Current progress: iteration {state.iterations}/{state.max_iterations}
                             )
                     
                     # Extract function call
-                    if not response.candidates:
+                    candidates = response.candidates
+                    if not candidates:
                         if retry_attempt < max_retries - 1:
                             import time
                             time.sleep(0.5 * (retry_attempt + 1))  # Exponential backoff
                             continue
                         return None
                     
-                    content = response.candidates[0].content
+                    content = candidates[0].content
+                    parts = getattr(content, 'parts', None)
                     
                     # Check if content is None (can happen with safety filters or empty responses)
-                    if content is None or not hasattr(content, 'parts') or content.parts is None:
+                    if parts is None:
                         if retry_attempt < max_retries - 1:
                             if self.output and retry_attempt == 0:
                                 self.output.print_warning("Empty response from model, retrying...")
@@ -252,16 +286,19 @@ Current progress: iteration {state.iterations}/{state.max_iterations}
                     # Gemini can return MULTIPLE function calls in parallel!
                     function_calls = []
                     
-                    for part in content.parts:
-                        if hasattr(part, 'function_call') and part.function_call:
-                            fc = part.function_call
+                    for part in parts:
+                        fc = getattr(part, 'function_call', None)
+                        if fc:
+                            fc_args = fc.args
                             function_calls.append({
                                 "tool": fc.name,
-                                "args": dict(fc.args) if fc.args else {}
+                                "args": dict(fc_args) if fc_args else {}
                             })
-                        elif hasattr(part, 'text') and part.text:
+                            continue
+                        text = getattr(part, 'text', None)
+                        if text:
                             # Agent provided reasoning
-                            state.add_thought(part.text)
+                            state.add_thought(text)
                     
                     # Only add to conversation if we found function call(s)
                     if function_calls:
@@ -361,12 +398,25 @@ Current progress: iteration {state.iterations}/{state.max_iterations}
             return result
             
         except Exception as e:
+            message = f"Tool execution error: {e}"
+            if DEBUG:
+                import traceback
+                message += f"\n{traceback.format_exc()}"
             return {
                 "tool": tool_name,
                 "success": False,
-                "output": f"Tool execution error: {e}\n{traceback.format_exc()}"
+                "output": message
             }
     
+    def _execute_tools_concurrently(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute a batch of read-only tool calls in parallel, preserving order."""
+        workers = min(len(tool_calls), MAX_PARALLEL_TOOLS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda call: self._execute_tool(call.get("tool"), call.get("args", {})),
+                tool_calls
+            ))
+    
     def _should_reflect(self, result: Dict[str, Any]) -> bool:
         """Decide if agent should reflect on result."""
         # Reflect on failures or surprising results
@@ -418,6 +468,16 @@ Provide a brief analysis and suggest the next action."""
             function_response_parts = []
             task_completed = False
             
+            # The leading run of read-only calls (e.g. several read_file/grep)
+            # overlaps its I/O; from the first call that mutates the workspace
+            # on, everything stays sequential so later reads see its effects
+            read_only_prefix = 0
+            while read_only_prefix < len(tool_calls) and tool_calls[read_only_prefix].get("tool") in READ_ONLY_TOOLS:
+                read_only_prefix += 1
+            prefetched = []
+            if read_only_prefix > 1:
+                prefetched = self._execute_tools_concurrently(tool_calls[:read_only_prefix])
+            
             for idx, tool_call in enumerate(tool_calls, 1):
                 tool_name = tool_call.get("tool")
                 tool_args = tool_call.get("args", {})
@@ -429,7 +489,10 @@ Provide a brief analysis and suggest the next action."""
                         self.output.print_agent_action(f"{tool_name}")
                 
                 # Execute tool
-                result = self._execute_tool(tool_name, tool_args)
+                if idx <= len(prefetched):
+                    result = prefetched[idx - 1]
+                else:
+                    result = self._execute_tool(tool_name, tool_args)
                 
                 if self.output:
                     self.output.print_tool_result(tool_name, result)
@@ -6,9 +6,21 @@ natural multi-turn conversations like Claude Code.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Any, Set
+from typing import List, Any, Dict
 from collections import deque
 
+# Cap on remembered file paths so long sessions don't grow the prompt unbounded
+MAX_FILES_TOUCHED = 100
+
+# Per-task character caps when rendering memory into the prompt
+MAX_REQUEST_CHARS = 500
+MAX_SUMMARY_CHARS = 300
+
+
+def _clip(text: str, limit: int) -> str:
+    """Shorten text to `limit` characters, marking the cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
 
 @dataclass
 class TaskMemory:
@@ -25,21 +37,27 @@ class TaskMemory:
 class ConversationMemory:
     """Maintains conversation context across multiple tasks."""
     
-    def __init__(self, max_tasks: int = 10):
+    def __init__(self, max_tasks: int = 10, max_files: int = MAX_FILES_TOUCHED):
         """Initialize conversation memory.
         
         Args:
             max_tasks: Maximum number of recent tasks to remember
+            max_files: Maximum number of recently touched files to remember
         """
         self.max_tasks = max_tasks
+        self.max_files = max_files
         self.tasks: deque[TaskMemory] = deque(maxlen=max_tasks)
-        self.all_files_touched: Set[str] = set()
+        # Insertion-ordered set: oldest paths are evicted once max_files is hit
+        self.all_files_touched: Dict[str, None] = {}
         
     def add_task(self, task: TaskMemory):
         """Add a completed task to memory."""
         self.tasks.append(task)
-        self.all_files_touched.update(task.files_created)
-        self.all_files_touched.update(task.files_modified)
+        for path in task.files_created + task.files_modified:
+            self.all_files_touched.pop(path, None)
+            self.all_files_touched[path] = None
+        while len(self.all_files_touched) > self.max_files:
+            del self.all_files_touched[next(iter(self.all_files_touched))]
     
     def get_recent_context(self, limit: int = 5) -> str:
         """Get formatted string of recent tasks for LLM context.
@@ -57,8 +75,17 @@ class ConversationMemory:
         lines = ["## Previous Conversation (Recent Tasks)"]
         lines.append("This is our conversation history from earlier in this session:\n")
         
-        for i, task in enumerate(recent_tasks, 1):
-            lines.append(f"**Task {i}**: {task.user_request}")
+        previous = None
+        i = 0
+        for task in recent_tasks:
+            # Skip a task that merely repeats the one before it
+            key = (task.user_request, task.summary, task.files_created,
+                   task.files_modified, task.key_outcomes)
+            if key == previous:
+                continue
+            previous = key
+            i += 1
+            lines.append(f"**Task {i}**: {_clip(task.user_request, MAX_REQUEST_CHARS)}")
             
             if task.files_created:
                 lines.append(f"  - Created: {', '.join(task.files_created)}")
@@ -67,7 +94,7 @@ class ConversationMemory:
                 lines.append(f"  - Modified: {', '.join(task.files_modified)}")
             
             if task.summary:
-                lines.append(f"  - Result: {task.summary}")
+                lines.append(f"  - Result: {_clip(task.summary, MAX_SUMMARY_CHARS)}")
             
             if task.key_outcomes:
                 for outcome in task.key_outcomes:
@@ -118,7 +145,7 @@ class ConversationMemory:
             elif tool == "edit_file":
                 output = result.get("output", "")
                 if "Edited" in output:
-                    path = output.replace("Edited", "").split("(")[0].strip()
+                    path = output.replace("Edited", "").partition("(")[0].strip()
                     if path not in files_modified:
                         files_modified.append(path)
             
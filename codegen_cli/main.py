@@ -9,10 +9,17 @@ A command-line assistant that understands natural language and can interact with
 Uses Google Gemini API for plan generation and executes actions through modular tools.
 """
 
+import atexit
+import gzip
 import os
 import json
-from datetime import datetime
-from typing import Any, Dict, List
+import shutil
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
 from . import output
@@ -81,10 +88,6 @@ def _load_additional_env():
 
                               
 _load_additional_env()
-try:
-    from google import genai
-except ImportError:
-    genai = None
 
 API_KEY = os.environ.get("GEMINI_API_KEY")
 CLIENT = None
@@ -96,11 +99,18 @@ def _ensure_client():
         return CLIENT
     _load_additional_env()
     API_KEY = os.environ.get("GEMINI_API_KEY")
-    if genai and API_KEY:
-        try:
-            CLIENT = genai.Client(api_key=API_KEY)
-        except Exception:
-            CLIENT = None
+    if not API_KEY:
+        return CLIENT
+    # Imported on first use: google.genai is slow to import and the
+    # --version/--help/--check-update commands never need it
+    try:
+        from google import genai
+    except ImportError:
+        return CLIENT
+    try:
+        CLIENT = genai.Client(api_key=API_KEY)
+    except Exception:
+        CLIENT = None
     return CLIENT
 
                              
@@ -128,8 +138,7 @@ def _get_pypi_latest_version(package_name: str = "codegen-cli") -> str:
 def _compare_versions(v1: str, v2: str) -> int:
     """Return -1 if v1<v2, 0 if equal, 1 if v1>v2 using loose semantic compare."""
     def _split(v: str):
-        import re
-        return [int(x) if x.isdigit() else x for x in re.split(r"[\.-]", v)]
+        return [int(x) if x.isdigit() else x for x in v.replace("-", ".").split(".")]
     try:
         a, b = _split(v1), _split(v2)
         for i in range(max(len(a), len(b))):
@@ -198,11 +207,51 @@ def _resolve_history_path() -> str:
         os.makedirs(user_cfg, exist_ok=True)
     except Exception:
         pass
-    return os.path.join(user_cfg, "history.json")
+    return os.path.join(user_cfg, "history.jsonl")
 
 HISTORY_PATH = _resolve_history_path()
+LEGACY_HISTORY_PATH = os.path.join(os.path.dirname(HISTORY_PATH), "history.json")
+
+
+def _history_line(entry: Dict[str, Any]) -> str:
+    """Serialize one history entry as a compact JSONL record."""
+    return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str) + "\n"
+
+
+def _convert_json_array(src: str, dst: str) -> bool:
+    """Rewrite a JSON-array history file at `src` as JSONL at `dst`."""
+    with open(src, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        return False
+    tmp_path = f"{dst}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8", errors="surrogatepass") as f:
+        f.writelines(_history_line(e) for e in data)
+    os.replace(tmp_path, dst)
+    return True
+
+def _migrate_legacy_history():
+    """One-time conversion of an old JSON-array history file into JSONL."""
+    try:
+        if os.path.exists(HISTORY_PATH):
+            # An override may point straight at an old-format file; convert it in place
+            with open(HISTORY_PATH, "rb") as f:
+                head = f.read(64).lstrip()
+            if head.startswith(b"["):
+                _convert_json_array(HISTORY_PATH, HISTORY_PATH)
+            return
+        if os.environ.get("CODEGEN_HISTORY_PATH") or not os.path.exists(LEGACY_HISTORY_PATH):
+            return
+        if _convert_json_array(LEGACY_HISTORY_PATH, HISTORY_PATH):
+            os.remove(LEGACY_HISTORY_PATH)
+    except Exception:
+        pass
+
+_migrate_legacy_history()
+
+# Directories skipped by the extension-count fallback in detect_project_type
+PROJECT_SCAN_SKIP_DIRS = frozenset({'node_modules', '__pycache__', 'venv', 'target', 'build', 'dist'})
 
-                        
 def detect_project_type(workspace_path: str) -> dict:
     """Detect the type of project in the workspace."""
     project_info = {
@@ -331,7 +380,7 @@ def detect_project_type(workspace_path: str) -> dict:
             ext_counts = {}
             for root, dirs, files in os.walk(workspace_path):
                 # Skip hidden and common ignored directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', '.venv', 'target', 'build', 'dist']]
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in PROJECT_SCAN_SKIP_DIRS]
                 
                 for file in files:
                     if file.startswith('.'):
@@ -370,25 +419,27 @@ PROJECT_INFO = detect_project_type(WORKSPACE_ROOT)
                              
                 
                              
-def handle_small_talk(user_text: str, append_history) -> bool:
-    """Handle common greetings, capability questions, and API key status."""
-    s = user_text.strip().lower()
+_GREETING_REPLY = ("Hello! How can I help you with your repository?", "greeting")
+_CASUAL_REPLY = ("Hey there! Ready to work on some code? What can I help you with?", "casual_greeting")
+_THANKS_REPLY = ("You're welcome! Happy to help. Anything else you'd like to work on?", "thanks")
+
+# Exact-match small talk resolved with a single dict lookup
+_SMALL_TALK_EXACT: Dict[str, Tuple[str, str]] = {
+    **dict.fromkeys(("hi", "hii", "hello", "hey", "heyy", "heyyy", "hiya", "yo", "yo!", "hey!", "hi!"), _GREETING_REPLY),
+    **dict.fromkeys(("sup", "what's up", "whats up", "wassup", "howdy", "greetings"), _CASUAL_REPLY),
+    **dict.fromkeys(("thanks", "thank you", "thx", "ty", "appreciate it", "thanks!"), _THANKS_REPLY),
+}
+
+
+@lru_cache(maxsize=256)
+def _classify_small_talk(s: str) -> Optional[Tuple[str, str]]:
+    """Return (reply, explain) for a normalized small-talk input, or None."""
+    exact = _SMALL_TALK_EXACT.get(s)
+    if exact is not None:
+        return exact
     
-    greetings = {"hi", "hii", "hello", "hey", "heyy", "heyyy", "hiya", "yo", "yo!", "hey!", "hi!"}
-    if s in greetings or (s.startswith(("hi", "hey", "hello")) and len(s) <= 10):
-        output.print_assistant("Hello! How can I help you with your repository?")
-        append_history(user_text, {"steps": [], "explain": "greeting"}, [])
-        return True
-    
-    if s in {"sup", "what's up", "whats up", "wassup", "howdy", "greetings"}:
-        output.print_assistant("Hey there! Ready to work on some code? What can I help you with?")
-        append_history(user_text, {"steps": [], "explain": "casual_greeting"}, [])
-        return True
-    
-    if s in {"thanks", "thank you", "thx", "ty", "appreciate it", "thanks!"}:
-        output.print_assistant("You're welcome! Happy to help. Anything else you'd like to work on?")
-        append_history(user_text, {"steps": [], "explain": "thanks"}, [])
-        return True
+    if s.startswith(("hi", "hey", "hello")) and len(s) <= 10:
+        return _GREETING_REPLY
     
     if ("what can you do" in s) or ("what do you do" in s) or ("capabilities" in s):
         reply = """# CodeGen CLI - Capabilities
@@ -401,57 +452,221 @@ Web: fetch_url, search_web
 System: run_command, manage_todos
 
 Try: 'read README.md', 'find **/*.py', 'grep TODO'"""
-        output.print_assistant(reply)
-        append_history(user_text, {"steps": [], "explain": "capabilities_reply"}, [])
-        return True
+        return reply, "capabilities_reply"
     
     if "your name" in s or "who are you" in s:
-        output.print_assistant("I am CodeGen, a CLI coding assistant.")
-        append_history(user_text, {"steps": [], "explain": "name_reply"}, [])
-        return True
+        return "I am CodeGen, a CLI coding assistant.", "name_reply"
     
-    return False
+    return None
 
 
+def handle_small_talk(user_text: str, append_history, normalized: Optional[str] = None) -> bool:
+    """Handle common greetings, capability questions, and API key status.
+
+    `normalized` is the stripped, lowercased text when the caller already has it.
+    """
+    if normalized is None:
+        normalized = user_text.strip().lower()
+    match = _classify_small_talk(normalized)
+    if match is None:
+        return False
+    reply, explain = match
+    output.print_assistant(reply)
+    append_history(user_text, {"steps": [], "explain": explain}, [])
+    return True
+
+
+
+# Exact listing requests answered by running list_files locally, with no model round-trip
+LOCAL_LIST_PHRASES = frozenset({
+    "ls", "list files", "list all files", "show files", "show all files",
+    "what files are here", "project structure", "show project structure",
+    "show me the project structure",
+})
+# Maximum number of paths printed for a local listing
+LOCAL_LIST_LIMIT = 200
+
+def handle_local_intent(user_text: str, append_history, normalized: Optional[str] = None) -> bool:
+    """Run simple read-only requests locally instead of through the agent loop."""
+    if normalized is None:
+        normalized = user_text.strip().lower()
+    if normalized.rstrip("?.! ") not in LOCAL_LIST_PHRASES:
+        return False
+    
+    from .tools_registry import get_tool_module
+    try:
+        result = get_tool_module("list_files").call(".")
+    except Exception as e:
+        output.print_error(f"Failed to list files: {e}")
+        append_history(user_text, {"error": str(e)}, [])
+        return True
+    
+    files = result.get("files", [])
+    body = "\n".join(files[:LOCAL_LIST_LIMIT]) or "(no files)"
+    if len(files) > LOCAL_LIST_LIMIT:
+        body += f"\n... and {len(files) - LOCAL_LIST_LIMIT} more"
+    output.print_boxed(f"Files ({len(files)})", body)
+    append_history(user_text, {"steps": [{"tool": "list_files", "args": {"path": "."}}], "explain": "local_list"}, [])
+    return True
 
-                             
-DESTRUCTIVE_TOOLS = {"write", "edit", "multiedit", "bash", "delete", "Write", "Edit", "MultiEdit", "Bash", "Delete"}
 
                              
                     
                              
+# The writer thread appends entries to the JSONL log in batches: once this many
+# are pending, or HISTORY_FLUSH_INTERVAL seconds after the first one (and at exit)
+HISTORY_FLUSH_EVERY = 8
+HISTORY_FLUSH_INTERVAL = 0.25
+# Once the log grows past this size it is archived as history.N.jsonl.gz and
+# a fresh live file is started
+HISTORY_MAX_BYTES = 8 * 1024 * 1024
+# Bytes read per backwards step when tailing the history log
+_HISTORY_TAIL_CHUNK = 64 * 1024
+
+
+def _read_history_tail(limit: int) -> List[str]:
+    """Return up to the last `limit` lines of the history log without reading it all."""
+    with open(HISTORY_PATH, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= limit:
+            step = min(_HISTORY_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if pos > 0:
+        lines = lines[1:]  # First line may be cut mid-record
+    return lines[-limit:]
+
+
 def load_history(limit: int = 20) -> List[Dict[str, Any]]:
-    """Load recent history from JSON file."""
+    """Load the most recent history entries (only the tail of the log is parsed)."""
+    if limit <= 0:
+        return []
+    _sync_history_writer()
     try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, list):
-                return []
-            return data[-limit:]
+        lines = _read_history_tail(limit)
     except FileNotFoundError:
-        return []
+        lines = []
     except Exception:
         return []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries[-limit:]
+
+def _archive_history():
+    """Move the live log aside and gzip it as the next free history.N.jsonl.gz.
+    
+    The live file is renamed first, so entries appended meanwhile (possibly by
+    another session) land in a fresh log instead of being truncated away.
+    """
+    tmp_path = f"{HISTORY_PATH}.rotating.{os.getpid()}"
+    try:
+        os.replace(HISTORY_PATH, tmp_path)
+    except FileNotFoundError:
+        return  # Another session rotated it first
+    base, _ = os.path.splitext(HISTORY_PATH)
+    n = 1
+    while True:
+        try:
+            # "x" fails instead of overwriting an archive another session just claimed
+            dst = gzip.open(f"{base}.{n}.jsonl.gz", "xb")
+            break
+        except FileExistsError:
+            n += 1
+    with open(tmp_path, "rb") as src, dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(tmp_path)
+
+def _write_history_lines(lines: List[str]):
+    """Append serialized entries to the log, rotating it once it grows too large."""
+    try:
+        parent = os.path.dirname(HISTORY_PATH)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with open(HISTORY_PATH, "a", encoding="utf-8", errors="surrogatepass") as f:
+            f.writelines(lines)
+        if os.path.getsize(HISTORY_PATH) > HISTORY_MAX_BYTES:
+            _archive_history()
+    except Exception:
+        pass
+
+# Serialized entries (or sync barriers) handed to the background writer, processed in order
+_HISTORY_QUEUE = queue.SimpleQueue()
+_HISTORY_WRITER: Optional[threading.Thread] = None
+
+def _history_writer():
+    pending: List[str] = []
+    deadline = 0.0
+    while True:
+        timeout = max(0.0, deadline - time.monotonic()) if pending else None
+        try:
+            item = _HISTORY_QUEUE.get(timeout=timeout)
+        except queue.Empty:
+            item = None  # Flush window elapsed
+        if isinstance(item, str):
+            pending.append(item)
+            if len(pending) == 1:
+                deadline = time.monotonic() + HISTORY_FLUSH_INTERVAL
+            if len(pending) < HISTORY_FLUSH_EVERY:
+                continue
+        if pending:
+            _write_history_lines(pending)
+            pending = []
+        if isinstance(item, threading.Event):
+            item.set()
+
+def _sync_history_writer(timeout: float = 5.0):
+    """Wait until every entry queued so far has reached the log."""
+    if _HISTORY_WRITER is None or not _HISTORY_WRITER.is_alive():
+        return
+    done = threading.Event()
+    _HISTORY_QUEUE.put(done)
+    done.wait(timeout)
+
+def flush_history():
+    """Write all pending history entries to the log before returning."""
+    if _HISTORY_WRITER is not None and _HISTORY_WRITER.is_alive():
+        _sync_history_writer()
+        return
+    # No writer running: drain whatever is queued on this thread
+    lines = []
+    while True:
+        try:
+            item = _HISTORY_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        if isinstance(item, str):
+            lines.append(item)
+    if lines:
+        _write_history_lines(lines)
+
+atexit.register(flush_history)
 
 def append_history(user_text: str, agent_plan: Any, results: Any):
-    """Save interaction to history file."""
+    """Record an interaction; entries are flushed to the log in batches."""
+    global _HISTORY_WRITER
     entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "ts": time.time_ns(),  # Epoch ns; rendered as ISO only when displayed
         "user": user_text,
         "agent_plan": agent_plan,
         "results": results
     }
-    hist = load_history(limit=1000)
-    hist.append(entry)
     try:
-                              
-        parent = os.path.dirname(HISTORY_PATH)
-        if parent:
-            os.makedirs(parent, exist_ok=True)
-        with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-            json.dump(hist, f, indent=2)
+        line = _history_line(entry)
     except Exception:
-        pass
+        return
+    # The REPL never waits on disk; the writer thread batches and appends
+    if _HISTORY_WRITER is None or not _HISTORY_WRITER.is_alive():
+        _HISTORY_WRITER = threading.Thread(target=_history_writer, name="codegen-history", daemon=True)
+        _HISTORY_WRITER.start()
+    _HISTORY_QUEUE.put(line)
   
 def repl():
     """Start the interactive REPL."""
@@ -462,12 +677,96 @@ def repl():
         "project_info": PROJECT_INFO,
         "output": output,
         "handle_small_talk": handle_small_talk,
+        "handle_local_intent": handle_local_intent,
         "append_history": append_history,
         "ensure_client": _ensure_client,
     }
     
     run_repl(deps)
 
+def _print_version(argv: List[str]) -> None:
+    try:
+        import importlib.metadata as _m
+        ver = _m.version("codegen-cli")
+    except Exception:
+        ver = "unknown"
+    body = "\n".join([
+        f"{output.Color.ACCENT}{output.Color.BOLD}CodeGen-CLI v{ver}{output.Color.RESET}",
+        "CLI coding agent that understands any codebase",
+    ])
+    output.print_boxed("Version", body, style="info")
+
+def _print_cli_help(argv: List[str]) -> None:
+    try:
+        output.print_help(PROJECT_INFO)
+    except Exception:
+        output.print_info("CodeGen-CLI - Universal Coding Agent", title="Help")
+
+def _print_history(argv: List[str]) -> None:
+    """Pretty-print recent history entries (the log itself is stored compact)."""
+    limit = 20
+    if len(argv) >= 3:
+        try:
+            limit = int(argv[2])
+        except ValueError:
+            output.print_warning(f"Invalid entry count: {argv[2]}", title="History")
+            return
+    entries = []
+    for entry in load_history(limit):
+        if "ts" in entry:
+            ts = datetime.fromtimestamp(entry.pop("ts") / 1e9, tz=timezone.utc)
+            entry = {"timestamp": ts.isoformat(timespec="seconds").replace("+00:00", "Z"), **entry}
+        entries.append(entry)
+    print(json.dumps(entries, indent=2, ensure_ascii=False))
+
+def _set_key(argv: List[str]) -> None:
+    global API_KEY
+                                                      
+    key = None
+    if len(argv) >= 3 and argv[2]:
+        key = argv[2]
+    if not key:
+        try:
+            key = input("Enter your Gemini API key: ").strip()
+        except (EOFError, KeyboardInterrupt):
+            output.print_warning("Aborted.", title="Setup")
+            return
+    if not key:
+        output.print_warning("No key provided.", title="Setup")
+        return
+    cfg_dir = Path.home() / ".config" / "codegen"
+    cfg_dir.mkdir(parents=True, exist_ok=True)
+    cfg_file = cfg_dir / ".env"
+    try:
+        with cfg_file.open("w", encoding="utf-8") as f:
+            f.write(f"GEMINI_API_KEY={key}\n")
+        output.print_success(f"Saved API key to {cfg_file}", title="Setup")
+                                               
+        os.environ["GEMINI_API_KEY"] = key
+        API_KEY = key
+        _ensure_client()
+        output.print_success("You're all set! Run 'codegen' in any project.", title="Setup")
+    except Exception as e:
+        output.print_error(f"Failed to save API key: {e}")
+
+# Command-line option -> handler(argv)
+CLI_COMMANDS = {
+    "--version": _print_version,
+    "-v": _print_version,
+    "version": _print_version,
+    "--check-update": lambda argv: _check_update(),
+    "check-update": lambda argv: _check_update(),
+    "update": lambda argv: _check_update(),
+    "--update": lambda argv: _check_update(),
+    "--help": _print_cli_help,
+    "-h": _print_cli_help,
+    "help": _print_cli_help,
+    "--set-key": _set_key,
+    "set-key": _set_key,
+    "--history": _print_history,
+    "history": _print_history,
+}
+
 def main():
     """Main entry point with command line argument support."""
     import sys
@@ -475,62 +774,13 @@ def main():
                                    
     if len(sys.argv) > 1:
         arg = sys.argv[1].lower()
-        if arg in ("--version", "-v", "version"):
-            try:
-                import importlib.metadata as _m
-                ver = _m.version("codegen-cli")
-            except Exception:
-                ver = "unknown"
-            body = "\n".join([
-                f"{output.Color.ACCENT}{output.Color.BOLD}CodeGen-CLI v{ver}{output.Color.RESET}",
-                "CLI coding agent that understands any codebase",
-            ])
-            output.print_boxed("Version", body, style="info")
-            return
-        elif arg in ("--check-update", "check-update", "update", "--update"):
-            _check_update()
-            return
-        elif arg in ("--help", "-h", "help"):
-            try:
-                output.print_help(PROJECT_INFO)
-            except Exception:
-                output.print_info("CodeGen-CLI - Universal Coding Agent", title="Help")
-            return
-
-        elif arg in ("--set-key", "set-key"):
-                                                          
-            key = None
-            if len(sys.argv) >= 3 and sys.argv[2]:
-                key = sys.argv[2]
-            if not key:
-                try:
-                    key = input("Enter your Gemini API key: ").strip()
-                except (EOFError, KeyboardInterrupt):
-                    output.print_warning("Aborted.", title="Setup")
-                    return
-            if not key:
-                output.print_warning("No key provided.", title="Setup")
-                return
-            cfg_dir = Path.home() / ".config" / "codegen"
-            cfg_dir.mkdir(parents=True, exist_ok=True)
-            cfg_file = cfg_dir / ".env"
-            try:
-                with cfg_file.open("w", encoding="utf-8") as f:
-                    f.write(f"GEMINI_API_KEY={key}\n")
-                output.print_success(f"Saved API key to {cfg_file}", title="Setup")
-                                                       
-                os.environ["GEMINI_API_KEY"] = key
-                global API_KEY
-                API_KEY = key
-                _ensure_client()
-                output.print_success("You're all set! Run 'codegen' in any project.", title="Setup")
-            except Exception as e:
-                output.print_error(f"Failed to save API key: {e}")
-            return
-        else:
+        handler = CLI_COMMANDS.get(arg)
+        if handler is None:
             output.print_warning(f"Unknown option: {arg}", title="CLI")
             output.print_info("Use 'codegen --help' for usage information", title="CLI")
             return
+        handler(sys.argv)
+        return
     
                     
     repl()
@@ -37,12 +37,6 @@ class ReadOutput(BaseModel):
 # WRITE TOOL
 # ============================================================================
 
-class WriteInput(BaseModel):
-    """Input schema for the Write tool."""
-    file_path: str = Field(..., description="The absolute path to the file to write")
-    content: str = Field(..., description="The content to write to the file")
-
-
 class WriteOutput(BaseModel):
     """Output schema for the Write tool."""
     message: str = Field(..., description="Success message")
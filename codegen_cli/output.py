@@ -6,12 +6,13 @@ Output formatting utilities for CodeGen2 CLI agent.
 Provides colored, structured output for user interactions, tool results, and error messages.
 """
 
+import io
 import os
 import re
 import shutil
 import sys
 import textwrap
-from typing import Any, Dict, List
+from typing import Any, Dict, List, TextIO
 
 ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
 
@@ -58,11 +59,14 @@ MAX_BOX_WIDTH = 110
 
 
 def _visible_len(text: str) -> int:
+    # Plain text (the norm with colors off) has no ESC byte; skip the regex
+    if "\x1b" not in text:
+        return len(text)
     return len(ANSI_ESCAPE_RE.sub("", text))
 
 
 def _contains_ansi(text: str) -> bool:
-    return bool(ANSI_ESCAPE_RE.search(text))
+    return "\x1b" in text and ANSI_ESCAPE_RE.search(text) is not None
 
 
 def _current_box_width() -> int:
@@ -150,8 +154,7 @@ def _render_panel(title: str, lines: List[str], style: str = "info") -> str:
 def _print_panel(title: str, content: str, style: str = "info") -> None:
     width = _current_box_width()
     lines = _wrap_lines(content, width - 4)
-    print()
-    print(_render_panel(title, lines, style=style))
+    print("\n" + _render_panel(title, lines, style=style))
 
                              
                        
@@ -185,8 +188,8 @@ def _format_tool_args(tool_name: str, args: dict) -> str:
         # Show file path
         file_path = args.get("file_path", "")
         if file_path:
-            # Show just filename or last 2 path components
-            parts = file_path.split("/")
+            # Show just filename or last 2 path components (only split off what we need)
+            parts = file_path.rsplit("/", 2)
             if len(parts) > 2:
                 return "/".join(parts[-2:])
             return file_path
@@ -317,6 +320,7 @@ A coding agent that understands any codebase and learns from results.
   API Key:  codegen --set-key YOUR_KEY
   Version:  codegen --version
   Updates:  codegen --check-update
+  History:  codegen --history [N]
   Exit:     Ctrl+C or type 'exit'
 
 Get your free Gemini API key: {Color.CODE}https://aistudio.google.com/api-keys{Color.RESET}"""
@@ -326,15 +330,27 @@ Get your free Gemini API key: {Color.CODE}https://aistudio.google.com/api-keys{C
                              
                           
                              
+# Strings, comments and keywords fused into one leftmost-first alternation so a
+# line is scanned once, and keywords inside strings/comments stay uncolored
+PY_TOKEN_RE = re.compile(
+    r'(?P<string>\'\'\'.*?\'\'\'|\"\"\".*?\"\"\"|\'.*?\'|\".*?\")'
+    r'|(?P<comment>#.*)'
+    r'|\b(?P<keyword>def|class|import|from|return|if|else|elif|for|while|with|try|except|finally|and|or|not|in|is|as|assert|del|global|nonlocal|lambda|pass|raise|yield|True|False|None)\b'
+)
+PY_TOKEN_COLORS = {
+    "string": Color.STRING,
+    "comment": Color.COMMENT,
+    "keyword": Color.KEYWORD,
+}
+
+
+def _colorize_token(match: "re.Match[str]") -> str:
+    return f"{PY_TOKEN_COLORS[match.lastgroup]}{match.group(0)}{Color.CODE}"
+
+
 def _colorize_python_code(line: str) -> str:
     """Apply simple syntax highlighting to Python code."""
-              
-    line = re.sub(r'\b(def|class|import|from|return|if|else|elif|for|while|with|try|except|finally|and|or|not|in|is|as|assert|del|global|nonlocal|lambda|pass|raise|yield|True|False|None)\b', f'{Color.KEYWORD}\\1{Color.CODE}', line)
-             
-    line = re.sub(r'(\'\'\'.*?\'\'\'|\"\"\".*?\"\"\"|\'.*?\'|\".*?\")', f'{Color.STRING}\\1{Color.CODE}', line)
-              
-    line = re.sub(r'(#.*)', f'{Color.COMMENT}\\1{Color.CODE}', line)
-    return line
+    return PY_TOKEN_RE.sub(_colorize_token, line)
 
 def _format_code_content(content: str, language: str = "python") -> str:
     """Format code content with syntax highlighting."""
@@ -410,12 +426,21 @@ def _looks_like_code(text: str) -> bool:
 
 def print_tool_result(tool_name: str, result: Dict[str, Any]):
     """Display tool execution result with structured schema support - ENHANCED."""
+    # Render into a buffer and emit one write instead of a print() per line
+    buf = io.StringIO()
+    _render_tool_result(tool_name, result, buf)
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+
+
+def _render_tool_result(tool_name: str, result: Dict[str, Any], out: TextIO):
+    """Write the tool result display to out."""
     success = bool(result.get("success", False))
     status = "✓" if success else "✗"
     status_color = Color.SUCCESS if success else Color.ERROR
     
     # Compact output: tool_name [status] + brief result
-    print(f"\n{status_color}{status} {tool_name}{Color.RESET}", end="")
+    print(f"\n{status_color}{status} {tool_name}{Color.RESET}", end="", file=out)
     
     output_data = result.get("output")
     
@@ -423,24 +448,24 @@ def print_tool_result(tool_name: str, result: Dict[str, Any]):
     if isinstance(output_data, dict):
         # ReadOutput schema
         if "total_lines" in output_data and "lines_returned" in output_data:
-            print(f" → Read {output_data['lines_returned']}/{output_data['total_lines']} lines")
+            print(f" → Read {output_data['lines_returned']}/{output_data['total_lines']} lines", file=out)
             return
         
         # WriteOutput schema
         if "bytes_written" in output_data and "file_path" in output_data:
-            print(f" → Wrote {output_data['bytes_written']} bytes to {output_data['file_path']}")
+            print(f" → Wrote {output_data['bytes_written']} bytes to {output_data['file_path']}", file=out)
             return
         
         # EditOutput schema
         if "replacements" in output_data:
-            print(f" → {output_data['replacements']} replacement(s) in {output_data.get('file_path', 'file')}")
+            print(f" → {output_data['replacements']} replacement(s) in {output_data.get('file_path', 'file')}", file=out)
             return
         
         # DeleteOutput schema
         if "deleted_items" in output_data:
-            print(f" → Deleted {output_data['count']} item(s)")
+            print(f" → Deleted {output_data['count']} item(s)", file=out)
             for item in output_data['deleted_items'][:3]:
-                print(f"  • {item}")
+                print(f"  • {item}", file=out)
             return
         
         # BashOutput schema - ENHANCED with stderr/stdout
@@ -450,9 +475,9 @@ def print_tool_result(tool_name: str, result: Dict[str, Any]):
             
             # Color code exit code
             if exit_code == 0:
-                print(f" → Exit code: {Color.SUCCESS}{exit_code}{Color.RESET}")
+                print(f" → Exit code: {Color.SUCCESS}{exit_code}{Color.RESET}", file=out)
             else:
-                print(f" → Exit code: {Color.ERROR}{exit_code}{Color.RESET}")
+                print(f" → Exit code: {Color.ERROR}{exit_code}{Color.RESET}", file=out)
             
             # Show output if present (first 300 chars)
             if output_text:
@@ -464,11 +489,11 @@ def print_tool_result(tool_name: str, result: Dict[str, Any]):
                 
                 if is_error and len(output_text) > 100:
                     # For errors, show STDERR prominently
-                    print(f"   {Color.ERROR}STDERR:{Color.RESET}")
+                    print(f"   {Color.ERROR}STDERR:{Color.RESET}", file=out)
                     for line in lines[:5]:  # Show first 5 lines
                         if line.strip():
                             truncated = line[:120] + "..." if len(line) > 120 else line
-                            print(f"   {truncated}")
+                            print(f"   {truncated}", file=out)
                 else:
                     # For successful output, show compactly
                     preview = output_text[:300]
@@ -476,76 +501,76 @@ def print_tool_result(tool_name: str, result: Dict[str, Any]):
                     preview = ' '.join(preview.split())
                     if len(output_text) > 300:
                         preview += "..."
-                    print(f"   {preview}")
+                    print(f"   {preview}", file=out)
             return
         
         # GlobOutput schema
         if "matches" in output_data and "search_path" in output_data:
-            print(f" → Found {output_data['count']} matches")
+            print(f" → Found {output_data['count']} matches", file=out)
             for match in output_data['matches'][:5]:
-                print(f"  • {match}")
+                print(f"  • {match}", file=out)
             return
         
         # LsOutput schema
         if "files" in output_data and isinstance(output_data['files'], list):
-            print(f" → {output_data['count']} files in {output_data.get('path', '')}")
+            print(f" → {output_data['count']} files in {output_data.get('path', '')}", file=out)
             for f in output_data['files'][:5]:
-                print(f"  • {f}")
+                print(f"  • {f}", file=out)
             return
         
         # GrepOutput schemas
         if "total_matches" in output_data:
-            print(f" → {output_data['total_matches']} matches")
+            print(f" → {output_data['total_matches']} matches", file=out)
             for match in output_data.get('matches', [])[:5]:
                 if isinstance(match, dict):
-                    print(f"  • {match.get('file')}:{match.get('line_number', '?')}")
+                    print(f"  • {match.get('file')}:{match.get('line_number', '?')}", file=out)
             return
         
         # WebSearchOutput schema
         if "results" in output_data and "query" in output_data:
-            print(f" → {output_data['total_results']} results for '{output_data['query']}'")
+            print(f" → {output_data['total_results']} results for '{output_data['query']}'", file=out)
             for res in output_data['results'][:3]:
                 if isinstance(res, dict):
-                    print(f"  • {res.get('title', '')[:60]}")
+                    print(f"  • {res.get('title', '')[:60]}", file=out)
             return
         
         # TodoWriteOutput schema
         if "stats" in output_data:
             stats = output_data['stats']
-            print(f" → {stats['total']} todos ({stats['pending']} pending, {stats['completed']} done)")
+            print(f" → {stats['total']} todos ({stats['pending']} pending, {stats['completed']} done)", file=out)
             return
         
         # MultiEditOutput schema
         if "total_edits" in output_data:
-            print(f" → {output_data['successful_edits']}/{output_data['total_edits']} edits successful")
+            print(f" → {output_data['successful_edits']}/{output_data['total_edits']} edits successful", file=out)
             return
         
         # Generic dict output
-        print(f" → {len(output_data)} fields")
+        print(f" → {len(output_data)} fields", file=out)
     
     # Handle list outputs
     elif isinstance(output_data, list):
         count = len(output_data)
-        print(f" → {count} items")
+        print(f" → {count} items", file=out)
         if count > 0 and count <= 5:
             for item in output_data[:5]:
                 item_str = str(item) if not isinstance(item, dict) else item.get("file", str(item))
-                print(f"  • {item_str[:80]}")
+                print(f"  • {item_str[:80]}", file=out)
     
     # Handle string outputs
     elif isinstance(output_data, str):
         preview = output_data[:200].replace('\n', ' ')
-        print(f" → {preview}..." if len(output_data) > 200 else f" → {preview}")
+        print(f" → {preview}..." if len(output_data) > 200 else f" → {preview}", file=out)
     
     # Handle other types
     elif output_data is not None:
-        print(f" → {str(output_data)[:100]}")
+        print(f" → {str(output_data)[:100]}", file=out)
     
     # Fallback to message
     else:
         msg = result.get("message", "")
         if msg:
-            print(f" → {msg[:100]}")
+            print(f" → {msg[:100]}", file=out)
 
                              
                                            
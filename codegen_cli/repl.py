@@ -6,15 +6,33 @@ REPL for CodeGen CLI.
 Uses iterative decision-making with Gemini function calling.
 """
 
+import atexit
 import os
 import shutil
 import sys
 import textwrap
+from pathlib import Path
 from typing import Any, Dict
 
+try:
+    import readline  # Enables line editing and up-arrow recall for input()
+except ImportError:
+    readline = None
+
 from .call_tools import create_agentic_loop
 from .conversation_memory import ConversationMemory
 
+INPUT_HISTORY_PATH = Path.home() / ".config" / "codegen" / "input_history"
+INPUT_HISTORY_LENGTH = 1000
+
+PROMPT_INSTRUCTIONS = (
+    "Type your instruction and press Enter.",
+    "Natural language requests are welcome; commands are optional.",
+)
+
+HELP_COMMANDS = frozenset({"help", "--help", "-h"})
+EXIT_COMMANDS = frozenset({"exit", "quit"})
+
 
 def _prompt_user_input_box(output_module) -> str:
     """Prompt user for input with styled box."""
@@ -31,41 +49,60 @@ def _prompt_user_input_box(output_module) -> str:
     header_line = f"{border}│{reset} {color.TITLE}{header}{reset} {border}│{reset}"
     bottom = f"{border}╰{'─' * (width - 2)}╯{reset}"
 
-    print()
-    print(top)
-    print(header_line)
-    instructions = [
-        "Type your instruction and press Enter.",
-        "Natural language requests are welcome; commands are optional."
-    ]
-    for line in instructions:
+    # Assemble the whole box header and emit it with a single write
+    lines = ["", top, header_line]
+    for line in PROMPT_INSTRUCTIONS:
         wrapped = textwrap.wrap(line, inner) or [""]
         for segment in wrapped:
-            print(f"{border}│{reset} {color.TEXT}{segment.ljust(inner)}{reset} {border}│{reset}")
+            lines.append(f"{border}│{reset} {color.TEXT}{segment.ljust(inner)}{reset} {border}│{reset}")
+    lines.append(f"{border}│{reset} {' ' * inner} {border}│{reset}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    print(f"{border}│{reset} {' ' * inner} {border}│{reset}")
     prompt_prefix = f"{border}│{reset} "
 
-    sys.stdout.write(prompt_prefix)
-    sys.stdout.flush()
+    if readline is not None and sys.stdin.isatty():
+        # Mark escape sequences as zero-width so readline computes the cursor column correctly
+        prompt_prefix = output_module.ANSI_ESCAPE_RE.sub(lambda m: f"\001{m.group(0)}\002", prompt_prefix)
 
-    raw = sys.stdin.readline()
-    if raw == "":
+    try:
+        user_line = input(prompt_prefix)
+    except EOFError:
         print(bottom)
-        raise EOFError
-    user_line = raw.rstrip("\n")
+        raise
 
     wrapped_input = textwrap.wrap(user_line, inner) or [""]
-    sys.stdout.write("\x1b[1A")
+    echo = ["\x1b[1A"]
     for idx, segment in enumerate(wrapped_input):
         if idx > 0:
-            sys.stdout.write(f"{border}│{reset} {' ' * inner} {border}│{reset}\n")
+            echo.append(f"{border}│{reset} {' ' * inner} {border}│{reset}\n")
         line_content = f"{border}│{reset} {color.TEXT}{segment.ljust(inner)}{reset} {border}│{reset}"
-        sys.stdout.write("\r\x1b[2K" + line_content + "\n")
-    print(bottom)
+        echo.append("\r\x1b[2K" + line_content + "\n")
+    echo.append(bottom + "\n")
+    sys.stdout.write("".join(echo))
+    sys.stdout.flush()
     return user_line
 
 
+def _load_input_history() -> None:
+    """Restore previous prompts for up-arrow recall and save them again on exit."""
+    if readline is None:
+        return
+    readline.set_history_length(INPUT_HISTORY_LENGTH)
+    try:
+        readline.read_history_file(INPUT_HISTORY_PATH)
+    except OSError:
+        pass
+
+    def _save():
+        try:
+            INPUT_HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+            readline.write_history_file(INPUT_HISTORY_PATH)
+        except OSError:
+            pass
+
+    atexit.register(_save)
+
+
 def _print_intro(workspace_root: str, project_info: Dict[str, Any], has_key: bool, output_module):
     """Print welcome banner."""
     color = output_module.Color
@@ -112,6 +149,7 @@ def run_repl(deps: Dict[str, Any]) -> None:
       - project_info: dict
       - output: module with print_* functions
       - handle_small_talk: function for small talk handling
+      - handle_local_intent: optional function answering simple requests locally
       - append_history: callable
       - ensure_client: callable -> client or None
     """
@@ -119,6 +157,7 @@ def run_repl(deps: Dict[str, Any]) -> None:
     project_info = deps["project_info"]
     output = deps["output"]
     handle_small_talk = deps["handle_small_talk"]
+    handle_local_intent = deps.get("handle_local_intent")
     append_history = deps["append_history"]
     ensure_client = deps["ensure_client"]
 
@@ -134,6 +173,7 @@ def run_repl(deps: Dict[str, Any]) -> None:
     agent = create_agentic_loop(client, output, conversation_memory)
 
     _print_intro(workspace_root, project_info, bool(os.environ.get("GEMINI_API_KEY")), output)
+    _load_input_history()
 
     while True:
         try:
@@ -143,25 +183,29 @@ def run_repl(deps: Dict[str, Any]) -> None:
             break
         if line is None:
             continue
-        line = line.rstrip("\n")
-        if not line.strip():
+        stripped = line.strip()
+        if not stripped:
             continue
 
-        low = line.strip().lower()
+        low = stripped.lower()
         
         # Handle built-in commands
-        if low in ("help", "--help", "-h"):
+        if low in HELP_COMMANDS:
             try:
                 output.print_help(project_info)
             except Exception:
                 output.print_assistant("Help: try natural language or tool invocations.")
             continue
-        if low in ("exit", "quit"):
+        if low in EXIT_COMMANDS:
             output.print_assistant("Bye.")
             break
 
         # Handle small talk
-        if handle_small_talk(line, append_history):
+        if handle_small_talk(line, append_history, normalized=low):
+            continue
+        
+        # Handle requests that need no model call (e.g. plain file listings)
+        if handle_local_intent and handle_local_intent(line, append_history, normalized=low):
             continue
 
         # Run agentic loop
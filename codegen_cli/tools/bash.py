@@ -21,6 +21,10 @@ DISALLOWED_COMMANDS = {
     "su", "passwd", "chmod 777", "chown", "dd", "mkfs", "fdisk"
 }
 
+# Any of these means the command needs a shell (pipes, redirections, chaining);
+# multi-char operators like '&&', '||' and '2>&1' are covered by their characters
+SHELL_METACHARS = frozenset("|><&;")
+
 
 def is_command_allowed(command: List[str]) -> tuple[bool, str]:
     """Check if command is allowed to execute."""
@@ -62,13 +66,11 @@ def run_command(command: str, timeout: Optional[int] = None, description: str =
     timeout_ms = input_data.timeout if input_data.timeout else 120000
     cmd = input_data.command
     
-    # Check if command contains shell features (pipes, redirections, etc.)
-    shell_features = ['|', '>', '<', '&', ';', '&&', '||', '2>&1']
     use_shell = False
     
     if isinstance(cmd, str):
-        # Check if we need shell mode
-        use_shell = any(feature in cmd for feature in shell_features)
+        # Shell mode takes the string as-is, so only plain commands pay for shlex
+        use_shell = not SHELL_METACHARS.isdisjoint(cmd)
         
         if not use_shell:
             try:
@@ -20,6 +20,9 @@ from ..models.schema import DeleteInput, DeleteOutput
 
 WORKSPACE = Path(os.getcwd())
 
+# Characters that make a delete target a glob pattern rather than a plain name
+GLOB_METACHARS = frozenset("*?[]")
+
 
 def _paths_for_pattern(pattern: str) -> List[Path]:
     candidate = WORKSPACE / pattern
@@ -27,7 +30,7 @@ def _paths_for_pattern(pattern: str) -> List[Path]:
         return [candidate]
 
     glob_pattern = pattern
-    if not any(ch in pattern for ch in "*?[]"):
+    if GLOB_METACHARS.isdisjoint(pattern):
         glob_pattern = f"**/{pattern}"
     return list(WORKSPACE.glob(glob_pattern))
 
@@ -8,6 +8,7 @@ Now includes optional Python syntax checking after edits.
 
 import os
 import re
+from typing import Tuple
 
 try:
     from google.genai import types
@@ -17,17 +18,58 @@ except ImportError:
 from ..models.schema import EditInput, EditOutput
 
 WORKSPACE = os.getcwd()
+_WORKSPACE_ABS = os.path.abspath(WORKSPACE)
 
 def is_safe_path(file_path: str) -> bool:
     """Check if file path is within workspace for security."""
     try:
         abs_path = os.path.abspath(file_path)
-        workspace_path = os.path.abspath(WORKSPACE)
-        return os.path.commonpath([workspace_path, abs_path]) == workspace_path
+        return os.path.commonpath([_WORKSPACE_ABS, abs_path]) == _WORKSPACE_ABS
     except (ValueError, OSError):
         return False
 
 
+def apply_edit(content: str, old_string: str, new_string: str, replace_all: bool = False) -> Tuple[str, int]:
+    """Apply a single find/replace to in-memory content.
+    
+    Returns:
+        Tuple of (new content, number of replacements). Raises ValueError if
+        old_string cannot be found, even with flexible whitespace matching.
+    """
+    # Special case: empty old_string means replace entire file
+    if old_string == "":
+        return new_string, 1
+    
+    if old_string not in content:
+        # Smart matching: try flexible whitespace matching
+        words = old_string.split()
+        if words:
+            pattern = r"\b" + r"\W+".join(re.escape(w) for w in words) + r"\b"
+            count = 0 if replace_all else 1
+            new_content, n = re.subn(pattern, new_string, content, count=count, flags=re.IGNORECASE)
+            if n > 0:
+                return new_content, n
+        raise ValueError(f"Text '{old_string}' not found in file")
+    
+    if replace_all:
+        new_content = content.replace(old_string, new_string)
+        return new_content, new_content.count(new_string)
+    return content.replace(old_string, new_string, 1), 1
+
+
+def check_edit_path(file_path: str) -> None:
+    """Raise if file_path is not an existing absolute path inside the workspace."""
+    if not os.path.isabs(file_path):
+        workspace = os.getcwd()
+        raise ValueError(f"file_path must be an absolute path. Got: '{file_path}'. Use: '{os.path.join(workspace, file_path)}'")
+    
+    if not is_safe_path(file_path):
+        raise ValueError(f"Access denied: {file_path} is outside workspace")
+    
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+
 def edit_file(file_path: str, old_string: str, new_string: str, replace_all: bool = False) -> EditOutput:
     """Edit an existing file by finding and replacing text.
     
@@ -54,63 +96,22 @@ def edit_file(file_path: str, old_string: str, new_string: str, replace_all: boo
     except Exception as e:
         raise ValueError(f"Invalid input: {e}")
     
-    if not os.path.isabs(input_data.file_path):
-        workspace = os.getcwd()
-        raise ValueError(f"file_path must be an absolute path. Got: '{input_data.file_path}'. Use: '{os.path.join(workspace, input_data.file_path)}'")
-    
-    if not is_safe_path(input_data.file_path):
-        raise ValueError(f"Access denied: {input_data.file_path} is outside workspace")
-    
-    if not os.path.exists(input_data.file_path):
-        raise FileNotFoundError(f"File not found: {input_data.file_path}")
-    
-    smart = True  # Default smart matching behavior
+    check_edit_path(input_data.file_path)
     
     try:
         with open(input_data.file_path, "r", encoding="utf-8", errors="replace") as file:
             original_content = file.read()
         
-        # Special case: empty old_string means replace entire file
-        if isinstance(input_data.old_string, str) and input_data.old_string == "":
-            with open(input_data.file_path, "w", encoding="utf-8") as file:
-                file.write(input_data.new_string)
-            
-            output = EditOutput(
-                message=f"Successfully edited {input_data.file_path}",
-                replacements=1,
-                file_path=input_data.file_path
-            )
-            return output
-
-        if input_data.old_string not in original_content:
-            if smart and isinstance(input_data.old_string, str):
-                # Smart matching: try flexible whitespace matching
-                words = [w for w in re.split(r"\s+", input_data.old_string.strip()) if w]
-                if words:
-                    pattern = r"\b" + r"\W+".join(re.escape(w) for w in words) + r"\b"
-                    count = 0 if input_data.replace_all else 1
-                    new_content, n = re.subn(pattern, input_data.new_string, original_content, count=count, flags=re.IGNORECASE)
-                    if n > 0:
-                        with open(input_data.file_path, "w", encoding="utf-8") as file:
-                            file.write(new_content)
-                        
-                        output = EditOutput(
-                            message=f"Successfully edited {input_data.file_path}",
-                            replacements=n,
-                            file_path=input_data.file_path
-                        )
-                        return output
-            raise ValueError(f"Text '{input_data.old_string}' not found in file")
-        
-        if input_data.replace_all:
-            new_content = original_content.replace(input_data.old_string, input_data.new_string)
-        else:
-            new_content = original_content.replace(input_data.old_string, input_data.new_string, 1)
+        new_content, replacements = apply_edit(
+            original_content,
+            input_data.old_string,
+            input_data.new_string,
+            bool(input_data.replace_all)
+        )
         
         with open(input_data.file_path, "w", encoding="utf-8") as file:
             file.write(new_content)
         
-        replacements = new_content.count(input_data.new_string) if input_data.replace_all else 1
         output = EditOutput(
             message=f"Successfully edited {input_data.file_path}",
             replacements=replacements,
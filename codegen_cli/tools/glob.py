@@ -20,6 +20,7 @@ except ImportError:
 from ..models.schema import GlobInput, GlobOutput
 
 WORKSPACE = os.getcwd()
+_WORKSPACE_ABS = os.path.abspath(WORKSPACE)
 
 def is_safe_path(file_path: str) -> bool:
     """
@@ -34,10 +35,9 @@ def is_safe_path(file_path: str) -> bool:
     try:
                                   
         abs_path = os.path.abspath(file_path)
-        workspace_path = os.path.abspath(WORKSPACE)
         
                                                    
-        return os.path.commonpath([workspace_path, abs_path]) == workspace_path
+        return os.path.commonpath([_WORKSPACE_ABS, abs_path]) == _WORKSPACE_ABS
     except (ValueError, OSError):
         return False
 
@@ -18,33 +18,55 @@ except ImportError:
 from ..models.schema import GrepInput, GrepMatch, GrepOutputContent, GrepOutputFiles
 
 WORKSPACE = os.getcwd()
+_WORKSPACE_ABS = os.path.abspath(WORKSPACE)
 
 def is_safe_path(file_path: str) -> bool:
     """Check if file path is within workspace."""
     try:
         abs_path = os.path.abspath(file_path)
-        workspace_path = os.path.abspath(WORKSPACE)
-        return os.path.commonpath([workspace_path, abs_path]) == workspace_path
+        return os.path.commonpath([_WORKSPACE_ABS, abs_path]) == _WORKSPACE_ABS
     except (ValueError, OSError):
         return False
 
-def search_in_file(file_path: str, pattern: str, multiline: bool = False) -> List[Dict[str, Any]]:
-    """Search for pattern in a single file."""
+REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _literal_needle(pattern: "re.Pattern[str]") -> Optional[str]:
+    """Return the pattern text if it has no regex syntax, else None."""
+    source = pattern.pattern
+    if pattern.flags & re.IGNORECASE or REGEX_METACHARS.intersection(source):
+        return None
+    return source
+
+
+def search_in_file(file_path: str, pattern: Union[str, "re.Pattern[str]"], multiline: bool = False) -> List[Dict[str, Any]]:
+    """Search for pattern in a single file.
+    
+    Callers searching many files should pass a pre-compiled pattern (compiled
+    with re.MULTILINE | re.DOTALL for multiline mode) so it is built only once.
+    """
     matches = []
     try:
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern, re.MULTILINE | re.DOTALL if multiline else 0)
         with open(file_path, "r", encoding="utf-8", errors="replace") as file:
             if multiline:
                 content = file.read()
-                flags = re.MULTILINE | re.DOTALL
-                for match in re.finditer(pattern, content, flags):
+                for match in pattern.finditer(content):
                     matches.append({
                         "file": file_path,
-                        "line_number": content[:match.start()].count('\n') + 1,
+                        "line_number": content.count('\n', 0, match.start()) + 1,
                         "line": match.group(0).strip()
                     })
             else:
+                # Plain-text patterns use a substring test instead of the regex engine
+                needle = _literal_needle(pattern)
+                if needle is not None:
+                    search = lambda line: needle in line
+                else:
+                    search = pattern.search
                 for line_num, line in enumerate(file, 1):
-                    if re.search(pattern, line):
+                    if search(line):
                         matches.append({
                             "file": file_path,
                             "line_number": line_num,
@@ -111,6 +133,12 @@ def grep(
     path_pattern = "**/*.py"  # Default pattern
     multiline_mode = input_data.multiline if input_data.multiline else False
     
+    # Compile once for the whole search rather than once per line
+    try:
+        compiled = re.compile(input_data.pattern, re.MULTILINE | re.DOTALL if multiline_mode else 0)
+    except re.error as e:
+        raise ValueError(f"Invalid regex pattern '{input_data.pattern}': {e}")
+    
     try:
         search_path = os.path.join(WORKSPACE, path_pattern)
         files = glob_search(search_path, recursive=True)
@@ -122,7 +150,7 @@ def grep(
         
         all_matches = []
         for file_path in safe_files:
-            matches = search_in_file(file_path, input_data.pattern, multiline_mode)
+            matches = search_in_file(file_path, compiled, multiline_mode)
             all_matches.extend(matches)
         
         if input_data.head_limit and len(all_matches) > input_data.head_limit:
@@ -7,7 +7,7 @@ Refactored to use Gemini's native Pydantic function calling with from_callable()
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 try:
     from google.genai import types
@@ -16,17 +16,26 @@ except ImportError:
 
 from ..models.schema import LsInput, LsOutput
 
-DEFAULT_IGNORE_DIRS = {
+DEFAULT_IGNORE_DIRS = frozenset({
     ".git", "node_modules", "__pycache__", ".venv", ".env", 
     ".cache", ".pytest_cache", "dist", "build"
-}
+})
+
+# Parsed .gitignore patterns per file, reused until the file's mtime changes
+_GITIGNORE_CACHE: Dict[Path, Tuple[float, List[str]]] = {}
 
 def read_gitignore_patterns(root: Path) -> List[str]:
     """Read .gitignore file and extract simple directory patterns."""
     gitignore_path = root / ".gitignore"
-    if not gitignore_path.exists():
+    try:
+        mtime = gitignore_path.stat().st_mtime
+    except OSError:
         return []
     
+    cached = _GITIGNORE_CACHE.get(gitignore_path)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+    
     patterns = []
     try:
         with open(gitignore_path, "r", encoding="utf-8") as f:
@@ -37,48 +46,49 @@ def read_gitignore_patterns(root: Path) -> List[str]:
     except Exception:
         pass
     
-    return patterns
-
-def should_ignore_path(path: Path, ignore_set: set, show_hidden: bool) -> bool:
-    """Check if a path should be ignored."""
-    if not show_hidden and path.name.startswith("."):
-        return True
-    
-    for part in path.parts:
-        if part in ignore_set:
-            return True
-    
-    return False
+    _GITIGNORE_CACHE[gitignore_path] = (mtime, patterns)
+    return list(patterns)
 
 def walk_directory(root: Path, max_depth: int = None, ignore_set: set = None, show_hidden: bool = False) -> List[str]:
     """Walk through directory and collect file paths."""
     if ignore_set is None:
-        ignore_set = DEFAULT_IGNORE_DIRS.copy()
+        ignore_set = DEFAULT_IGNORE_DIRS
     
     files = []
+    if max_depth is not None and max_depth <= 0:
+        return files
     
-    try:
-        for dirpath, dirnames, filenames in os.walk(root):
-            current_path = Path(dirpath)
-            depth = len(current_path.relative_to(root).parts)
-            
-            if max_depth is not None and depth >= max_depth:
-                dirnames.clear()
-                continue
-            
-            dirnames[:] = [d for d in dirnames if d not in ignore_set]
-            
-            for filename in filenames:
-                file_path = current_path / filename
-                if not should_ignore_path(file_path, ignore_set, show_hidden):
-                    rel_path = file_path.relative_to(root)
-                    files.append(str(rel_path))
-    
-    except Exception:
-        pass
+    # scandir's DirEntry carries the file type from the directory read, so no
+    # per-entry stat is needed; relative paths are built by string prefixing
+    stack = [(str(root), "", 1)]
+    while stack:
+        dir_path, prefix, depth = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name in ignore_set:
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Hidden directories are pruned along with hidden files
+                        if not show_hidden and name.startswith("."):
+                            continue
+                        # Like os.walk, symlinked directories are not followed
+                        if (max_depth is None or depth < max_depth) and not entry.is_symlink():
+                            stack.append((entry.path, prefix + name + os.sep, depth + 1))
+                        continue
+                    if not show_hidden and name.startswith("."):
+                        continue
+                    files.append(prefix + name)
+        except OSError:
+            continue
     
-    return sorted(files)
-
+    files.sort()
+    return files
 
 def list_files(path: str = ".", depth: Optional[int] = None, show_hidden: bool = False) -> LsOutput:
     """List files and directories in the workspace.
@@ -116,10 +126,8 @@ def list_files(path: str = ".", depth: Optional[int] = None, show_hidden: bool =
         max_depth = input_data.depth
         show_hidden_files = input_data.show_hidden
         
-        ignore_set = DEFAULT_IGNORE_DIRS.copy()
-        
         gitignore_patterns = read_gitignore_patterns(root_path)
-        ignore_set.update(gitignore_patterns)
+        ignore_set = DEFAULT_IGNORE_DIRS.union(gitignore_patterns)
         
         files = walk_directory(root_path, max_depth, ignore_set, show_hidden_files)
         
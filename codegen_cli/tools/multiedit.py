@@ -8,7 +8,7 @@ Performs multiple file edits atomically in sequence. All edits must succeed or a
 import os
 from typing import List, Dict, Any, Optional
 
-from .edit import edit_file
+from .edit import apply_edit, check_edit_path
 
 try:
     from google.genai import types
@@ -58,6 +58,9 @@ def multi_edit(path: Optional[str] = None, edits: List[MultiEditChange] = None)
         raise ValueError("At least one edit operation is required")
     
     summary = []
+    # Each file is read once and written once, however many edits touch it.
+    # Nothing is written until every edit has applied cleanly in memory.
+    contents: Dict[str, str] = {}
     
     for i, edit_change in enumerate(input_data.edits, start=1):
         # Get the path for this edit (use edit's path or fall back to base path)
@@ -71,17 +74,18 @@ def multi_edit(path: Optional[str] = None, edits: List[MultiEditChange] = None)
         replace_all = edit_change.replace_all if edit_change.replace_all is not None else False
         
         try:
-            res = edit_file(
-                file_path=edit_path,
-                old_string=old_value,
-                new_string=new_value,
-                replace_all=replace_all
-            )
+            check_edit_path(edit_path)
+            # Key by the resolved file so differently spelled paths share one buffer
+            real_path = os.path.realpath(edit_path)
+            if real_path not in contents:
+                with open(real_path, "r", encoding="utf-8", errors="replace") as file:
+                    contents[real_path] = file.read()
+            contents[real_path], _ = apply_edit(contents[real_path], old_value, new_value, replace_all)
             result_obj = MultiEditResult(
                 step=i,
                 path=edit_path,
                 success=True,
-                message=res.message
+                message=f"Successfully edited {edit_path}"
             )
             summary.append(result_obj)
         except Exception as e:
@@ -94,6 +98,13 @@ def multi_edit(path: Optional[str] = None, edits: List[MultiEditChange] = None)
             summary.append(result_obj)
             raise IOError(f"Edit step {i} failed: {e}")
     
+    for edit_path, new_content in contents.items():
+        try:
+            with open(edit_path, "w", encoding="utf-8") as file:
+                file.write(new_content)
+        except Exception as e:
+            raise IOError(f"Error writing {edit_path}: {e}")
+    
     output = MultiEditOutput(
         results=summary,
         total_edits=len(summary),
@@ -16,13 +16,13 @@ except ImportError:
 from ..models.schema import ReadInput, ReadOutput
 
 WORKSPACE = os.getcwd()
+_WORKSPACE_ABS = os.path.abspath(WORKSPACE)
 
 def is_safe_path(file_path: str) -> bool:
     """Check if file path is within workspace for security."""
     try:
         abs_path = os.path.abspath(file_path)
-        workspace_path = os.path.abspath(WORKSPACE)
-        return os.path.commonpath([workspace_path, abs_path]) == workspace_path
+        return os.path.commonpath([_WORKSPACE_ABS, abs_path]) == _WORKSPACE_ABS
     except (ValueError, OSError):
         return False
 
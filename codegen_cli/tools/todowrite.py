@@ -34,32 +34,37 @@ DB_DIR = str(DB_DIR_P)
 DB_FILE = str(DB_FILE_P)
 
 
-def ensure_database():
-    """Ensure the database directory and file exist."""
-    if not os.path.exists(DB_DIR):
-        os.makedirs(DB_DIR, exist_ok=True)
-    if not os.path.exists(DB_FILE):
-        with open(DB_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
-
-
 def read_todos() -> List[Dict[str, Any]]:
-    """Read all todos from the database."""
-    ensure_database()
+    """Read all todos from the database (a missing database reads as empty)."""
+    try:
+        with open(DB_FILE, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return []
+    # Only a JSON array is a valid database; anything else reads as empty without parsing
+    if not raw.lstrip().startswith(b"["):
+        return []
     try:
-        with open(DB_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
+        return json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return []
 
 
 def write_todos_to_db(todos: List[Dict[str, Any]]):
     """Write todos to the database."""
-    ensure_database()
+    os.makedirs(DB_DIR, exist_ok=True)
     with open(DB_FILE, "w", encoding="utf-8") as f:
         json.dump(todos, f, indent=2)
 
 
+def clear_todos():
+    """Drop all todos; a missing database already reads as an empty list."""
+    try:
+        os.remove(DB_FILE)
+    except FileNotFoundError:
+        pass
+
+
 def _is_todo_item(obj: Any) -> bool:
     """Validate a single todo item shape."""
     if not isinstance(obj, dict):
@@ -98,6 +103,11 @@ def manage_todos(todos: List[TodoItem]) -> TodoWriteOutput:
             TodoItem(id="2", content="Update file2.py", status="pending")
         ])
     """
+    return _manage_todos(todos)
+
+
+def _manage_todos(todos: List[TodoItem], existing: Optional[List[Dict[str, Any]]] = None) -> TodoWriteOutput:
+    """Implementation of manage_todos; reuses an already-loaded todo list when given."""
     # Validate using Pydantic model
     try:
         input_data = TodoWriteInput(todos=todos or [])
@@ -106,7 +116,7 @@ def manage_todos(todos: List[TodoItem]) -> TodoWriteOutput:
     
     if not input_data.todos:
         # If no todos provided, return current list
-        existing_todos = read_todos()
+        existing_todos = read_todos() if existing is None else existing
         stats = TodoStats(
             total=len(existing_todos),
             pending=len([t for t in existing_todos if t.get("status") == "pending"]),
@@ -135,9 +145,12 @@ def manage_todos(todos: List[TodoItem]) -> TodoWriteOutput:
         todos_as_dicts.append(todo_dict)
     
     # Always merge by ID to avoid overwriting existing todos
-    existing = read_todos()
+    if existing is None:
+        existing = read_todos()
     updated = _merge_by_id(existing, todos_as_dicts)
-    write_todos_to_db(updated)
+    # Re-sending todos that are already stored (same status) needs no write
+    if updated != existing:
+        write_todos_to_db(updated)
     
     return TodoWriteOutput(
         tool="todowrite",
@@ -178,39 +191,23 @@ def call(action: Union[str, list, dict] = "list", *args, **kwargs) -> Dict[str,
             priority=d.get("priority")
         )
     
-    # Handle direct list of todos (batch mode)
+    # Batch mode: a list of todos passed directly, as first arg, in a dict, or as kwargs
+    batch = None
     if isinstance(action, list):
-        todo_items = [dict_to_todo_item(t, i) if isinstance(t, dict) else t 
-                     for i, t in enumerate(action)]
-        result = manage_todos(todos=todo_items)
-        return result.model_dump()
+        batch = action
+    elif args and isinstance(args[0], list):
+        batch = args[0]
+    elif args and isinstance(args[0], dict) and isinstance(args[0].get("todos"), list):
+        batch = args[0]["todos"]
+    elif kwargs.get("todos") and isinstance(kwargs.get("todos"), list):
+        batch = kwargs["todos"]
     
-    # Handle list passed as first argument
-    if args and isinstance(args[0], list):
+    if batch is not None:
         todo_items = [dict_to_todo_item(t, i) if isinstance(t, dict) else t 
-                     for i, t in enumerate(args[0])]
+                     for i, t in enumerate(batch)]
         result = manage_todos(todos=todo_items)
         return result.model_dump()
     
-    # Handle dict with todos key
-    if args and isinstance(args[0], dict):
-        obj = args[0]
-        todos_arg = obj.get("todos")
-        if isinstance(todos_arg, list):
-            todo_items = [dict_to_todo_item(t, i) if isinstance(t, dict) else t 
-                         for i, t in enumerate(todos_arg)]
-            result = manage_todos(todos=todo_items)
-            return result.model_dump()
-    
-    # Handle kwargs todos
-    if kwargs.get("todos"):
-        todos_arg = kwargs.get("todos")
-        if isinstance(todos_arg, list):
-            todo_items = [dict_to_todo_item(t, i) if isinstance(t, dict) else t 
-                         for i, t in enumerate(todos_arg)]
-            result = manage_todos(todos=todo_items)
-            return result.model_dump()
-    
     # Handle individual actions (convert to batch operations)
     action_str = action if isinstance(action, str) else "list"
     
@@ -226,7 +223,8 @@ def call(action: Union[str, list, dict] = "list", *args, **kwargs) -> Dict[str,
             content=text.strip(),
             status="pending"
         )
-        result = manage_todos(todos=[new_todo])
+        # Hand over the list just read so the database isn't parsed twice
+        result = _manage_todos([new_todo], existing=existing_todos)
         return result.model_dump()
     
     elif action_str == "list":
@@ -252,14 +250,8 @@ def call(action: Union[str, list, dict] = "list", *args, **kwargs) -> Dict[str,
         }
     
     elif action_str == "clear":
-        # Clear all todos
-        write_todos_to_db([])
-        try:
-            import shutil
-            if os.path.exists(DB_DIR):
-                shutil.rmtree(DB_DIR)
-        except Exception:
-            pass
+        # Clear all todos with a single unlink; DB_DIR also holds history and the API key
+        clear_todos()
         return {
             "tool": "todowrite",
             "success": True,
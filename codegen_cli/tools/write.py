@@ -6,26 +6,69 @@ Refactored to use Gemini's native Pydantic function calling with from_callable()
 """
 
 import os
+from typing import Optional
 
 try:
     from google.genai import types
 except ImportError:
     types = None
 
-from ..models.schema import WriteInput, WriteOutput
+from ..models.schema import WriteOutput
 
 WORKSPACE = os.getcwd()
+_WORKSPACE_ABS = os.path.abspath(WORKSPACE)
 
-def is_safe_path(file_path: str) -> bool:
-    """Check if file path is within workspace for security."""
+
+def _within_workspace(abs_path: str) -> bool:
+    """Check an already-normalized absolute path against the workspace root."""
+    try:
+        return os.path.commonpath([_WORKSPACE_ABS, abs_path]) == _WORKSPACE_ABS
+    except ValueError:
+        return False
+
+
+def _same_content(file_path: str, data: bytes, st: Optional[os.stat_result]) -> bool:
+    """Return True if the file (already stat'ed as `st`) holds exactly these bytes."""
+    if st is None or st.st_size != len(data):
+        return False
     try:
-        abs_path = os.path.abspath(file_path)
-        workspace_path = os.path.abspath(WORKSPACE)
-        return os.path.commonpath([workspace_path, abs_path]) == workspace_path
-    except (ValueError, OSError):
+        with open(file_path, "rb") as file:
+            return file.read() == data
+    except OSError:
         return False
 
 
+def _atomic_write(file_path: str, data: bytes, st: Optional[os.stat_result]) -> None:
+    """Write bytes to a sibling temp file, then atomically replace the target.
+    
+    `file_path` must already be resolved (no symlink), and `st` is the existing
+    file's stat (or None for a new file) whose mode and ownership are restored.
+    """
+    tmp_path = f"{file_path}.tmp.{os.getpid()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            if st is not None:
+                if hasattr(os, "fchown"):
+                    try:
+                        os.fchown(file.fileno(), st.st_uid, st.st_gid)
+                    except OSError:
+                        pass  # Not permitted to give the file back to its owner
+                # Set the exact mode last; os.open() applied the umask and chown may clear setuid
+                if hasattr(os, "fchmod"):
+                    os.fchmod(file.fileno(), st.st_mode & 0o7777)
+                else:
+                    os.chmod(tmp_path, st.st_mode & 0o7777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def write_file(file_path: str, content: str) -> WriteOutput:
     """Create a new file or overwrite an existing file with content.
     
@@ -38,36 +81,42 @@ def write_file(file_path: str, content: str) -> WriteOutput:
     Returns:
         WriteOutput Pydantic model containing success message, bytes written, and file path.
     """
-    # Validate using Pydantic model
-    try:
-        input_data = WriteInput(
-            file_path=file_path,
-            content=content
-        )
-    except Exception as e:
-        raise ValueError(f"Invalid input: {e}")
+    # Both fields are plain strings, so a type check is all the validation needed
+    if not isinstance(file_path, str) or not isinstance(content, str):
+        raise ValueError("Invalid input: file_path and content must be strings")
     
-    if not os.path.isabs(input_data.file_path):
+    if not os.path.isabs(file_path):
         workspace = os.getcwd()
-        raise ValueError(f"file_path must be an absolute path. Got: '{input_data.file_path}'. Use: '{os.path.join(workspace, input_data.file_path)}'")
+        raise ValueError(f"file_path must be an absolute path. Got: '{file_path}'. Use: '{os.path.join(workspace, file_path)}'")
     
-    if not is_safe_path(input_data.file_path):
-        raise ValueError(f"Access denied: {input_data.file_path} is outside workspace")
+    # Normalize once and use the result for both the safety check and the I/O
+    abs_path = os.path.normpath(file_path)
+    if not _within_workspace(abs_path):
+        raise ValueError(f"Access denied: {file_path} is outside workspace")
+    
+    # One stat serves the parent-dir check, the unchanged-content check and the file mode
+    try:
+        st = os.stat(abs_path)
+    except OSError:
+        st = None
     
     try:
-        directory = os.path.dirname(input_data.file_path)
-        if directory and not os.path.exists(directory):
+        directory = os.path.dirname(abs_path)
+        if st is None and directory and not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
         
-        with open(input_data.file_path, "w", encoding="utf-8") as file:
-            file.write(input_data.content)
+        data = content.encode('utf-8')
+        # Skip the write entirely when the file already has this content
+        if not _same_content(abs_path, data, st):
+            # Replace the symlink's target, not the link itself
+            _atomic_write(os.path.realpath(abs_path), data, st)
         
-        bytes_written = len(input_data.content.encode('utf-8'))
+        bytes_written = len(data)
         
         output = WriteOutput(
-            message=f"Successfully wrote to {input_data.file_path}",
+            message=f"Successfully wrote to {file_path}",
             bytes_written=bytes_written,
-            file_path=input_data.file_path
+            file_path=file_path
         )
         
         return output
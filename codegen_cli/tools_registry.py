@@ -7,13 +7,16 @@ Provides centralized access to all available tools and their function declaratio
 """
 
 import importlib
-from typing import List, Dict, Any, Optional
+import logging
+from types import ModuleType
+from typing import List, Dict, Any, Optional, Tuple
 
 try:
     from google.genai import types
 except ImportError:
     types = None
 
+logger = logging.getLogger(__name__)
 
 # Map of tool names to their module names (only the essential tools)
 TOOL_MODULES = {
@@ -31,32 +34,44 @@ TOOL_MODULES = {
     "search_web": "websearch",
 }
 
-# Map of legacy tool names to new names (for backwards compatibility)
+# Map of legacy tool names to new names (for backwards compatibility).
+# Legacy names are the tool module names, so this is TOOL_MODULES inverted.
 LEGACY_TOOL_NAMES = {
-    "read": "read_file",
-    "write": "write_file",
-    "edit": "edit_file",
-    "multiedit": "multi_edit",
-    "ls": "list_files",
-    "glob": "find_files",
-    "bash": "run_command",
-    "delete": "delete_file",
-    "todowrite": "manage_todos",
-    "webfetch": "fetch_url",
-    "websearch": "search_web",
+    module_name: tool_name
+    for tool_name, module_name in TOOL_MODULES.items()
+    if module_name != tool_name
 }
 
+# Flat lookup of canonical and legacy names straight to module names
+_NAME_TO_MODULE = dict(TOOL_MODULES)
+_NAME_TO_MODULE.update({legacy: TOOL_MODULES[canonical] for legacy, canonical in LEGACY_TOOL_NAMES.items()})
+
+
+def _preload_tool_modules() -> Dict[str, ModuleType]:
+    """Import every registered tool module once, keyed by module name."""
+    modules: Dict[str, ModuleType] = {}
+    for module_name in TOOL_MODULES.values():
+        try:
+            modules[module_name] = importlib.import_module(f"codegen_cli.tools.{module_name}")
+        except Exception:
+            # A broken or unavailable tool must not break the registry; it is
+            # retried lazily on use and reported when declarations are built
+            logger.debug("Deferred loading tool module '%s'", module_name, exc_info=True)
+    return modules
+
+
+# Tool modules imported at registry load so dispatch is a plain dict lookup
+_MODULES: Dict[str, ModuleType] = _preload_tool_modules()
+
 
 def get_tool_module(tool_name: str):
     """Load a tool module by name (handles both new and legacy names)."""
-    # Normalize to new name
-    normalized_name = LEGACY_TOOL_NAMES.get(tool_name, tool_name)
+    # Unknown names fall back to using the tool name as module name
+    module_name = _NAME_TO_MODULE.get(tool_name, tool_name)
     
-    # Get module name
-    module_name = TOOL_MODULES.get(normalized_name)
-    if not module_name:
-        # Try using tool name as module name
-        module_name = tool_name
+    module = _MODULES.get(module_name)
+    if module is not None:
+        return module
     
     try:
         return importlib.import_module(f"codegen_cli.tools.{module_name}")
@@ -64,51 +79,74 @@ def get_tool_module(tool_name: str):
         raise RuntimeError(f"Tool '{tool_name}' not found")
 
 
-def get_all_function_declarations(client=None):
-    """Get function declarations for all tools.
-    
-    Args:
-        client: Gemini client instance (required for from_callable() in tools)
-        
-    Returns:
-        List of FunctionDeclaration objects for all tools
-    """
-    if types is None:
-        return []
+# Special task_complete function, built once at import
+_TASK_COMPLETE_DECLARATION = None
+if types is not None:
+    _TASK_COMPLETE_DECLARATION = types.FunctionDeclaration(
+        name="task_complete",
+        description="Call this when the task is fully completed",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "summary": types.Schema(
+                    type=types.Type.STRING,
+                    description="Summary of what was accomplished"
+                )
+            },
+            required=["summary"]
+        )
+    )
+
+# Tool declarations built for the last client: from_callable() introspects each
+# tool signature, so rebuilding them for the same client is wasted work
+_declarations_cache: Optional[Tuple[Any, List[Any]]] = None
+
+
+def _get_tool_declarations(client) -> List[Any]:
+    """Build (or reuse) the from_callable() declarations for every tool."""
+    global _declarations_cache
+    if _declarations_cache is not None and _declarations_cache[0] is client:
+        return _declarations_cache[1]
     
     declarations = []
+    complete = True
     for tool_name, module_name in TOOL_MODULES.items():
         try:
-            module = importlib.import_module(f"codegen_cli.tools.{module_name}")
+            module = _MODULES.get(module_name) or importlib.import_module(f"codegen_cli.tools.{module_name}")
             if hasattr(module, 'get_function_declaration'):
                 # Pass client to get_function_declaration for from_callable() support
                 decl = module.get_function_declaration(client)
                 if decl:
                     declarations.append(decl)
         except Exception as e:
-            # Skip tools that fail to load (log error for debugging)
-            import traceback
+            # Skip tools that fail to load (traceback only at debug level)
             print(f"Warning: Failed to load tool '{tool_name}': {e}")
-            traceback.print_exc()
+            logger.debug("Failed to load tool '%s'", tool_name, exc_info=True)
+            complete = False
             continue
     
+    # Only a full set is reused; after a failure the next call retries every tool
+    if complete:
+        _declarations_cache = (client, declarations)
+    return declarations
+
+
+def get_all_function_declarations(client=None):
+    """Get function declarations for all tools.
+    
+    Args:
+        client: Gemini client instance (required for from_callable() in tools)
+        
+    Returns:
+        List of FunctionDeclaration objects for all tools
+    """
+    if types is None:
+        return []
+    
+    declarations = list(_get_tool_declarations(client))
+    
     # Add special task_complete function
-    declarations.append(
-        types.FunctionDeclaration(
-            name="task_complete",
-            description="Call this when the task is fully completed",
-            parameters=types.Schema(
-                type=types.Type.OBJECT,
-                properties={
-                    "summary": types.Schema(
-                        type=types.Type.STRING,
-                        description="Summary of what was accomplished"
-                    )
-                },
-                required=["summary"]
-            )
-        )
-    )
+    declarations.append(_TASK_COMPLETE_DECLARATION)
     
     return declarations
 
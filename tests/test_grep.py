@@ -0,0 +1,23 @@
+"""Tests for the grep tool."""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from codegen_cli.tools import grep as grep_tool
+
+
+def test_invalid_regex_reports_clear_error():
+    with pytest.raises(ValueError, match="Invalid regex pattern"):
+        grep_tool.grep(pattern="foo(")
+
+
+def test_literal_pattern_matches(tmp_path, monkeypatch):
+    (tmp_path / "sample.py").write_text("x = 1\nneedle = 2\n", encoding="utf-8")
+    monkeypatch.setattr(grep_tool, "WORKSPACE", str(tmp_path))
+    monkeypatch.setattr(grep_tool, "_WORKSPACE_ABS", str(tmp_path))
+
+    result = grep_tool.grep(pattern="needle")
+
+    assert result.total_matches == 1
+    assert result.matches[0].line_number == 2
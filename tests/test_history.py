@@ -0,0 +1,61 @@
+"""Tests for the JSONL history log in codegen_cli.main."""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from codegen_cli import main
+
+
+@pytest.fixture
+def history_path(tmp_path, monkeypatch):
+    path = tmp_path / "history.jsonl"
+    monkeypatch.setattr(main, "HISTORY_PATH", str(path))
+    return path
+
+
+def _read_all_entries(directory):
+    """Collect entries from every archive and the live log, in rotation order."""
+    entries = []
+    archives = sorted(
+        directory.glob("history.*.jsonl.gz"),
+        key=lambda p: int(p.name.split(".")[1]),
+    )
+    for archive in archives:
+        with gzip.open(archive, "rt", encoding="utf-8") as f:
+            entries.extend(json.loads(line) for line in f)
+    live = directory / "history.jsonl"
+    if live.exists():
+        with open(live, encoding="utf-8") as f:
+            entries.extend(json.loads(line) for line in f)
+    return entries
+
+
+def test_rotation_keeps_every_entry(history_path, monkeypatch):
+    monkeypatch.setattr(main, "HISTORY_MAX_BYTES", 500)
+
+    for batch in range(20):
+        lines = [main._history_line({"user": f"q{batch}-{i}"}) for i in range(3)]
+        main._write_history_lines(lines)
+
+    directory = history_path.parent
+    assert list(directory.glob("history.*.jsonl.gz")), "log never crossed HISTORY_MAX_BYTES"
+    assert not list(directory.glob("*.rotating.*"))
+
+    users = [entry["user"] for entry in _read_all_entries(directory)]
+    assert users == [f"q{batch}-{i}" for batch in range(20) for i in range(3)]
+
+
+def test_rotation_does_not_overwrite_existing_archive(history_path, monkeypatch):
+    monkeypatch.setattr(main, "HISTORY_MAX_BYTES", 10)
+    existing = history_path.parent / "history.1.jsonl.gz"
+    with gzip.open(existing, "wb") as f:
+        f.write(main._history_line({"user": "older"}).encode("utf-8"))
+
+    main._write_history_lines([main._history_line({"user": "newer"})])
+
+    assert os.path.exists(history_path.parent / "history.2.jsonl.gz")
+    users = [entry["user"] for entry in _read_all_entries(history_path.parent)]
+    assert users == ["older", "newer"]